@@ -1,45 +1,224 @@
+import json
 import os
 import shutil
+import subprocess
 import unittest
+from glob import glob
+from importlib.util import find_spec
 from tempfile import TemporaryDirectory
+from unittest import mock
 
-from tuf_on_ci._repository import CIRepository
-from tuf_on_ci.signing_event import _find_changed_target_roles
+from click.testing import CliRunner
+from tuf.api.metadata import Metadata
+from tuf.api.serialization import DeserializationError
+from tuf.repository import AbortEdit
+
+from tuf_on_ci._git import git
+from tuf_on_ci._repository import (
+    _DESERIALIZER,
+    CIRepository,
+    _copy_to_all,
+    glob_files,
+    glob_match,
+)
+from tuf_on_ci.create_signing_events import create_signing_events
+from tuf_on_ci.signing_event import (
+    _git_changed_files,
+    _git_changed_roles,
+    _git_changed_target_roles,
+    _head_info,
+    update_targets,
+)
+
+
+def _link(src: str, dst: str) -> None:
+    """Hardlink src to dst, copy if linking is not possible (e.g. across devices)
+
+    Only use this for files that the test does not modify"""
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+
+def _linktree(src: str, dst: str) -> None:
+    """Populate dst with links to the files in src, see _link()"""
+    for root, _, files in os.walk(src):
+        dst_dir = os.path.join(dst, os.path.relpath(root, src))
+        os.makedirs(dst_dir, exist_ok=True)
+        for f in files:
+            _link(os.path.join(root, f), os.path.join(dst_dir, f))
 
 
 class TestCIRepository(unittest.TestCase):
+    repo1: CIRepository
+    repo2: CIRepository
+
+    @classmethod
+    def setUpClass(cls):
+        # these repositories are only read by the tests: share them
+        cls.repo1 = CIRepository("test/test_repo1")
+        cls.repo2 = CIRepository("test/test_repo2")
+
     def test_non_existing_repo(self):
         repo = CIRepository("no_such_file")
         self.assertRaises(ValueError, repo.open, "root")
 
     def test_signing_expiry_days_root(self):
-        repo = CIRepository("test/test_repo1")
-
-        signing_days, expiry_days = repo.signing_expiry_period("root")
+        signing_days, expiry_days = self.repo1.signing_expiry_period("root")
         self.assertEqual(signing_days, 60)
         self.assertEqual(expiry_days, 365)
 
     def test_signing_expiry_days_targets(self):
-        repo = CIRepository("test/test_repo1")
-
-        signing_days, expiry_days = repo.signing_expiry_period("targets")
+        signing_days, expiry_days = self.repo1.signing_expiry_period("targets")
         self.assertEqual(signing_days, 40)
         self.assertEqual(expiry_days, 123)
 
     def test_signing_expiry_days_role(self):
-        repo = CIRepository("test/test_repo2")
-
-        signing_days, expiry_days = repo.signing_expiry_period("timestamp")
+        signing_days, expiry_days = self.repo2.signing_expiry_period("timestamp")
         self.assertEqual(signing_days, 6)
         self.assertEqual(expiry_days, 40)
 
     def test_default_signing_days(self):
-        repo = CIRepository("test/test_repo1")
-
-        signing_days, expiry_days = repo.signing_expiry_period("timestamp")
+        signing_days, expiry_days = self.repo1.signing_expiry_period("timestamp")
         self.assertEqual(signing_days, 2)
         self.assertEqual(expiry_days, 4)
 
+    def test_metadata_cache(self):
+        with TemporaryDirectory("_tuf_on_ci") as temp_dir:
+            shutil.copytree("test/test_repo1", temp_dir, dirs_exist_ok=True)
+            repo = CIRepository(temp_dir)
+            self.assertIs(repo.open("targets"), repo.open("targets"))
+
+            # changes in an aborted edit must not be visible afterwards
+            with repo.edit_targets() as targets:
+                version = targets.version
+                targets.version += 1
+                raise AbortEdit
+            self.assertEqual(repo.targets().version, version)
+
+    def test_metadata_cache_invalidate(self):
+        with TemporaryDirectory("_tuf_on_ci") as temp_dir:
+            shutil.copytree("test/test_repo1", temp_dir, dirs_exist_ok=True)
+            repo = CIRepository(temp_dir)
+            version = repo.targets().version
+
+            # rewrite the file with same size and mtime, like a fast git checkout
+            path = os.path.join(temp_dir, "targets.json")
+            st = os.stat(path)
+            with open(path, "rb") as f:
+                data = f.read()
+            old = f'"version": {version}'.encode()
+            new = f'"version": {version + 1}'.encode()
+            self.assertEqual(len(old), len(new))
+            with open(path, "wb") as f:
+                f.write(data.replace(old, new))
+            os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns))
+
+            self.assertEqual(repo.targets().version, version)
+            repo.invalidate("targets")
+            self.assertEqual(repo.targets().version, version + 1)
+
+    def test_deserializer(self):
+        loaders = [json.loads]
+        if find_spec("orjson") is not None:
+            import orjson
+
+            loaders.append(orjson.loads)
+
+        with open("test/test_repo1/root.json", "rb") as f:
+            data = f.read()
+        expected = Metadata.from_bytes(data)
+
+        for loads in loaders:
+            with (
+                self.subTest(loads=loads.__module__),
+                mock.patch("tuf_on_ci._repository._json_loads", loads),
+            ):
+                self.assertEqual(_DESERIALIZER.deserialize(data), expected)
+                with self.assertRaises(DeserializationError):
+                    _DESERIALIZER.deserialize(b"{")
+                with self.assertRaises(DeserializationError):
+                    _DESERIALIZER.deserialize(b"{}")
+
+    def test_glob_files(self):
+        root_dir = "test/test_repo3/src_targets"
+        patterns = [
+            "*",
+            "*/*",
+            "*/*/*",
+            "myrole/*",
+            "myrole/dir1/*/*",
+            "*/dir1/file1.txt",
+            "tfile1.txt",
+            "t?ile[0-9].txt",
+            "no_such_dir/*",
+        ]
+        for pattern in patterns:
+            expected = {
+                path
+                for path in glob(pattern, root_dir=root_dir)
+                if os.path.isfile(os.path.join(root_dir, path))
+            }
+            self.assertEqual(glob_files(root_dir, [pattern]), expected, pattern)
+
+        # multiple patterns give the union of the results
+        expected = glob_files(root_dir, ["*"]) | glob_files(root_dir, ["myrole/*"])
+        self.assertEqual(glob_files(root_dir, ["*", "myrole/*"]), expected)
+
+        # results are always within root_dir
+        self.assertEqual(glob_files(f"{root_dir}/myrole", ["../*"]), set())
+
+    def test_glob_match(self):
+        patterns = [
+            "*",
+            "*/*",
+            ".*",
+            "myrole/*",
+            "myrole/.*",
+            "myrole/dir1/*/*",
+            "*/dir1/file1.txt",
+        ]
+        with TemporaryDirectory("_tuf_on_ci") as temp_dir:
+            shutil.copytree("test/test_repo3/src_targets", temp_dir, dirs_exist_ok=True)
+            # hidden files are only matched by patterns starting with "."
+            for path in [".hidden", "myrole/.hidden", "myrole/.dir/file"]:
+                fullpath = os.path.join(temp_dir, path)
+                os.makedirs(os.path.dirname(fullpath), exist_ok=True)
+                with open(fullpath, "w") as f:
+                    f.write("data")
+
+            files = set()
+            for root, _, names in os.walk(temp_dir):
+                for name in names:
+                    files.add(os.path.relpath(os.path.join(root, name), temp_dir))
+
+            for pattern in patterns:
+                globbed = glob(pattern, root_dir=temp_dir)
+                expected = {path for path in globbed if path in files}
+                matched = {path for path in files if glob_match(path, [pattern])}
+                self.assertEqual(matched, expected, pattern)
+
+    def test_copy_to_all(self):
+        with TemporaryDirectory("_tuf_on_ci") as temp_dir:
+            src = os.path.join(temp_dir, "src")
+            with open(src, "w") as f:
+                f.write("data")
+            dsts = [os.path.join(temp_dir, f"dst{i}") for i in range(3)]
+            # an existing destination gets replaced
+            with open(dsts[2], "w") as f:
+                f.write("old data")
+
+            _copy_to_all(src, dsts)
+            for dst in dsts:
+                with open(dst) as f:
+                    self.assertEqual(f.read(), "data")
+
+            # first destination is a copy, the others are links to it
+            self.assertFalse(os.path.samefile(src, dsts[0]))
+            self.assertTrue(os.path.samefile(dsts[0], dsts[1]))
+            self.assertTrue(os.path.samefile(dsts[0], dsts[2]))
+
     # def test_bump_expires_expired(self):
     #     repo = CIRepository("test/test_repo1")
     #     ver = repo.bump_expiring("timestamp")
@@ -54,6 +233,7 @@ class TestCIRepository(unittest.TestCase):
             os.makedirs(temp_targets)
             os.makedirs(temp_meta)
             src_targets = os.path.join(repo_path, "src_targets")
+            # metadata gets modified by the test: copy it instead of linking
             shutil.copytree(good_meta, temp_meta, dirs_exist_ok=True)
             repo = CIRepository(temp_meta, good_meta)
             targets = repo.targets("targets")
@@ -67,14 +247,17 @@ class TestCIRepository(unittest.TestCase):
             self.assertNotIn("tfile1.txt", targets.targets)
 
             # adding these files and updating adds them to targets
-            shutil.copy(os.path.join(src_targets, "tfile1.txt"), temp_targets)
+            _link(
+                os.path.join(src_targets, "tfile1.txt"),
+                os.path.join(temp_targets, "tfile1.txt"),
+            )
             repo.update_targets("targets")
             targets = repo.targets("targets")
             self.assertIn("tfile1.txt", targets.targets)
             self.assertEqual(len(targets.targets), 1)
 
             # targets does not support multiple levels right now
-            shutil.copytree(
+            _linktree(
                 os.path.join(src_targets, "other_dir"),
                 os.path.join(temp_targets, "other_dir"),
             )
@@ -89,7 +272,7 @@ class TestCIRepository(unittest.TestCase):
             targets = repo.targets("myrole")
             self.assertEqual(len(targets.targets), 0)
 
-            shutil.copytree(
+            _linktree(
                 os.path.join(src_targets, "myrole"),
                 os.path.join(temp_targets, "myrole"),
             )
@@ -101,7 +284,7 @@ class TestCIRepository(unittest.TestCase):
             self.assertNotIn("myrole/dir1/dir2/dir3/dir4/file4.txt", targets.targets)
 
             # existing roles without deep paths are honored (deeper targets are ignored)
-            shutil.copytree(
+            _linktree(
                 os.path.join(src_targets, "oldrole"),
                 os.path.join(temp_targets, "oldrole"),
             )
@@ -111,11 +294,184 @@ class TestCIRepository(unittest.TestCase):
             self.assertIn("oldrole/file0.txt", targets.targets)
             self.assertNotIn("oldrole/dir1/file1.txt", targets.targets)
 
-            # changed roles are detected properly
-            roles = _find_changed_target_roles(repo, temp_targets, "targets")
-            self.assertSetEqual(
-                roles, {"myrole", "targets", "oldrole"}, "unexpect roles found"
-            )
+
+def _write(path: str, data: str) -> None:
+    """Write data to path, creating parent directories if needed"""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w") as f:
+        f.write(data)
+
+
+def _git(*args: str) -> str:
+    """Run git in the current directory, return stdout"""
+    cmd = ["git", *args]
+    return subprocess.run(cmd, check=True, capture_output=True, text=True).stdout
+
+
+def _commit(msg: str) -> str:
+    """Commit all changes in the current directory, return the commit"""
+    _git("add", "--all")
+    _git("commit", "--quiet", "-m", msg)
+    return _git("rev-parse", "HEAD").strip()
+
+
+class TestSigningEventGit(unittest.TestCase):
+    """Tests that run the tools in a git repository
+
+    The tools use paths relative to the repository root: the tests run in a
+    temporary git repository with the test_repo3 metadata"""
+
+    def setUp(self):
+        good_meta = os.path.abspath("test/test_repo3/good/metadata")
+        self.src_targets = os.path.abspath("test/test_repo3/src_targets")
+
+        temp_dir = TemporaryDirectory("_tuf_on_ci")
+        self.addCleanup(temp_dir.cleanup)
+        self.addCleanup(os.chdir, os.getcwd())
+        os.chdir(temp_dir.name)
+
+        _git("init", "--quiet", "--initial-branch", "main")
+        _git("config", "user.name", "Test")
+        _git("config", "user.email", "test@example.com")
+        _git("config", "commit.gpgsign", "false")
+        shutil.copytree(good_meta, "metadata")
+        os.makedirs("metadata/root_history")
+        shutil.copy("metadata/root.json", "metadata/root_history/1.root.json")
+        _write("targets/tfile1.txt", "tfile1")
+        self.base = _commit("initial")
+
+        # the signing event branch is compared to origin/main
+        _git("update-ref", "refs/remotes/origin/main", self.base)
+        _git("checkout", "--quiet", "-b", "sign/event")
+
+    def test_git_identity(self):
+        git(["commit", "--quiet", "--allow-empty", "-m", "default"])
+        git(["commit", "--quiet", "--allow-empty", "-m", "named"], name="tuf-on-ci")
+        log = _git("log", "-2", "--format=%an %cn %ae").splitlines()
+        email = "41898282+github-actions[bot]@users.noreply.github.com"
+        self.assertEqual(
+            log, [f"tuf-on-ci tuf-on-ci {email}", f"TUF-on-CI TUF-on-CI {email}"]
+        )
+
+    def test_head_info(self):
+        self.assertEqual(_head_info(), ("sign/event", self.base))
+
+        # a tag with the same name makes the branch name ambiguous
+        _git("tag", "sign/event")
+        self.assertEqual(_head_info(), ("sign/event", self.base))
+
+        _git("checkout", "--quiet", "--detach")
+        self.assertEqual(_head_info(), ("", self.base))
+
+    def test_git_changed_files(self):
+        self.assertEqual(_git_changed_files(self.base, "targets/"), [])
+
+        # file names are not quoted or escaped
+        _write("targets/tfile1.txt", "modified")
+        _write("targets/file with space.txt", "data")
+        _write("targets/dir/\u00fcml\u00e4ut.txt", "data")
+        _write("metadata/unrelated.txt", "data")
+        _commit("changes")
+
+        self.assertEqual(
+            _git_changed_files(self.base, "targets/"),
+            [
+                "targets/dir/\u00fcml\u00e4ut.txt",
+                "targets/file with space.txt",
+                "targets/tfile1.txt",
+            ],
+        )
+
+    def test_git_changed_roles(self):
+        self.assertEqual(_git_changed_roles(self.base), set())
+
+        with open("metadata/myrole.json", "a") as f:
+            f.write("\n")
+        shutil.copy("metadata/oldrole.json", "metadata/newrole.json")
+        # removed roles, non-json files and subdirectories are not reported
+        os.remove("metadata/oldrole.json")
+        _write("metadata/README.md", "data")
+        _write("metadata/root_history/2.root.json", "data")
+        _commit("metadata changes")
+        self.assertEqual(_git_changed_roles(self.base), {"myrole", "newrole"})
+
+        # online roles are never changed in a signing event
+        with open("metadata/timestamp.json", "a") as f:
+            f.write("\n")
+        _commit("online role change")
+        with self.assertRaises(RuntimeError):
+            _git_changed_roles(self.base)
+
+    def test_git_changed_target_roles(self):
+        repo = CIRepository("metadata")
+        self.assertEqual(_git_changed_target_roles(repo, self.base), set())
+
+        # only artifacts matching the delegated paths are considered
+        _write("targets/oldrole/dir1/file1.txt", "data")
+        _write("targets/other_dir/otherfile.txt", "data")
+        _commit("unmatched artifacts")
+        self.assertEqual(_git_changed_target_roles(repo, self.base), set())
+
+        _write("targets/myrole/dir1/file1.txt", "data")
+        os.remove("targets/tfile1.txt")
+        _commit("matched artifacts")
+        self.assertEqual(
+            _git_changed_target_roles(repo, self.base), {"myrole", "targets"}
+        )
+
+    def test_update_targets(self):
+        _write("targets/tfile1.txt", "modified")
+        _linktree(
+            os.path.join(self.src_targets, "myrole"), os.path.join("targets", "myrole")
+        )
+        head = _commit("artifact changes")
+
+        result = CliRunner().invoke(update_targets, ["--no-push"])
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn("role(s) `myrole`, `targets`", result.output)
+
+        # all changed roles are updated in a single commit
+        log = _git("log", "--format=%s", f"{head}..HEAD")
+        self.assertEqual(
+            log.splitlines(), ["Update targets metadata for role(s) myrole, targets"]
+        )
+        changed = _git("show", "--name-only", "--format=", "HEAD")
+        self.assertEqual(
+            changed.splitlines(), ["metadata/myrole.json", "metadata/targets.json"]
+        )
+        self.assertEqual(_git("status", "--porcelain"), "")
+
+        # metadata is now in sync with artifacts
+        head = _git("rev-parse", "HEAD").strip()
+        result = CliRunner().invoke(update_targets, ["--no-push"])
+        self.assertEqual(result.exit_code, 1, result.output)
+        self.assertEqual(_git("rev-parse", "HEAD").strip(), head)
+
+    def test_create_signing_events(self):
+        # all offline roles in test_repo3 have expired
+        events = [
+            "sign/myrole-v2",
+            "sign/oldrole-v2",
+            "sign/root-v2",
+            "sign/targets-v3",
+        ]
+        list_branches = ["branch", "--list", "--format=%(refname:short)", "sign/*-v*"]
+
+        result = CliRunner().invoke(create_signing_events)
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertEqual(sorted(result.output.split()), events)
+        self.assertEqual(_git(*list_branches).split(), events)
+        self.assertEqual(_git("rev-parse", "HEAD").strip(), self.base)
+        self.assertEqual(_git("status", "--porcelain"), "")
+
+        # existing branches are not recreated and the worktree is left clean
+        branch_heads = _git("rev-parse", *events)
+        result = CliRunner().invoke(create_signing_events)
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertEqual(result.output.strip(), "")
+        self.assertEqual(_git("rev-parse", *events), branch_heads)
+        self.assertEqual(_git("rev-parse", "HEAD").strip(), self.base)
+        self.assertEqual(_git("status", "--porcelain"), "")
 
 
 if __name__ == "__main__":
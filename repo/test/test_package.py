@@ -0,0 +1,32 @@
+import importlib
+import unittest
+
+import click
+
+import tuf_on_ci
+
+
+class TestPackage(unittest.TestCase):
+    def test_commands(self):
+        commands = [name for name in tuf_on_ci.__all__ if name != "__version__"]
+        for name in commands:
+            self.assertIsInstance(getattr(tuf_on_ci, name), click.Command, name)
+
+    def test_commands_after_submodule_import(self):
+        # importing a command module must not hide the command of the same name
+        for name in [
+            "build_repository",
+            "client",
+            "create_signing_events",
+            "online_sign",
+        ]:
+            importlib.import_module(f"tuf_on_ci.{name}")
+            self.assertIsInstance(getattr(tuf_on_ci, name), click.Command, name)
+
+        from tuf_on_ci import client
+
+        self.assertIsInstance(client, click.Command)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,9 +1,22 @@
+import importlib
+from typing import Any
+
 from tuf_on_ci._version import __version__
+
+# These commands have the same name as their module. They are imported eagerly:
+# otherwise importing the submodule first would make the package attribute
+# refer to the module instead of the command
 from tuf_on_ci.build_repository import build_repository
 from tuf_on_ci.client import client
 from tuf_on_ci.create_signing_events import create_signing_events
 from tuf_on_ci.online_sign import online_sign
-from tuf_on_ci.signing_event import online_sign_targets, status, update_targets
+
+# The signing event commands are imported on first access
+_LAZY = {
+    "online_sign_targets": "tuf_on_ci.signing_event",
+    "status": "tuf_on_ci.signing_event",
+    "update_targets": "tuf_on_ci.signing_event",
+}
 
 __all__ = [
     "__version__",
@@ -15,3 +28,16 @@ __all__ = [
     "status",
     "update_targets",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(_LAZY[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return __all__
@@ -0,0 +1,63 @@
+# Copyright 2024 Google LLC
+
+"""Git command helpers shared by the TUF-on-CI command line tools"""
+
+import logging
+import os
+import subprocess
+
+logger = logging.getLogger(__name__)
+
+_GIT_NAME = "TUF-on-CI"
+_GIT_EMAIL = "41898282+github-actions[bot]@users.noreply.github.com"
+
+# Commits are made with the TUF-on-CI identity. The tools never need optional
+# locks (e.g. index refresh in status)
+_GIT_ENV = {
+    **os.environ,
+    "GIT_AUTHOR_NAME": _GIT_NAME,
+    "GIT_AUTHOR_EMAIL": _GIT_EMAIL,
+    "GIT_COMMITTER_NAME": _GIT_NAME,
+    "GIT_COMMITTER_EMAIL": _GIT_EMAIL,
+    "GIT_OPTIONAL_LOCKS": "0",
+}
+
+
+def git(
+    cmd: list[str], *, capture: bool = True, name: str = _GIT_NAME
+) -> subprocess.CompletedProcess:
+    """Run a git command, raise CalledProcessError on failure
+
+    If capture is False, stdout is discarded (the tools write their results to
+    stdout so git output must not end up there) and stderr is left visible in
+    the CI logs. name is the author and committer name for new commits."""
+    cmd = ["git", *cmd]
+    env = _GIT_ENV
+    if name != _GIT_NAME:
+        env = {**env, "GIT_AUTHOR_NAME": name, "GIT_COMMITTER_NAME": name}
+    if capture:
+        proc = subprocess.run(cmd, check=True, capture_output=True, text=True, env=env)
+        logger.debug("%s:\n%s", cmd, proc.stdout)
+    else:
+        proc = subprocess.run(
+            cmd, check=True, stdout=subprocess.DEVNULL, text=True, env=env
+        )
+        logger.debug("%s", cmd)
+    return proc
+
+
+def git_start(cmd: list[str]) -> subprocess.Popen:
+    """Start a git command without waiting for it: see git_output()"""
+    cmd = ["git", *cmd]
+    return subprocess.Popen(
+        cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, env=_GIT_ENV
+    )
+
+
+def git_output(proc: subprocess.Popen) -> str:
+    """Wait for a git command started with git_start(), return stripped stdout"""
+    stdout, stderr = proc.communicate()
+    if proc.returncode:
+        raise subprocess.CalledProcessError(proc.returncode, proc.args, stdout, stderr)
+    logger.debug("%s:\n%s", proc.args, stdout)
+    return stdout.strip()
@@ -1,11 +1,14 @@
-import json
 import logging
 import os
 import shutil
+from collections.abc import Generator, Iterable
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager, suppress
 from dataclasses import dataclass
 from datetime import UTC, datetime, timedelta
 from enum import Enum, unique
-from glob import glob
+from fnmatch import fnmatch
+from glob import glob, has_magic
 
 from securesystemslib.exceptions import UnverifiedSignatureError
 from securesystemslib.signer import (
@@ -22,14 +25,25 @@ from tuf.api.metadata import (
     Metadata,
     MetaFile,
     Root,
+    Signed,
     Snapshot,
     TargetFile,
     Targets,
     Timestamp,
 )
-from tuf.api.serialization.json import CanonicalJSONSerializer, JSONSerializer
+from tuf.api.serialization import DeserializationError
+from tuf.api.serialization.json import (
+    CanonicalJSONSerializer,
+    JSONDeserializer,
+    JSONSerializer,
+)
 from tuf.repository import AbortEdit, Repository
 
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads  # type: ignore[assignment]
+
 # sigstore is not a supported key by default
 KEY_FOR_TYPE_AND_SCHEME[("sigstore-oidc", "Fulcio")] = SigstoreKey
 SIGNER_FOR_URI_SCHEME[SigstoreSigner.SCHEME] = SigstoreSigner
@@ -37,17 +51,132 @@ SIGNER_FOR_URI_SCHEME[SigstoreSigner.SCHEME] = SigstoreSigner
 TAG_KEYOWNER = "x-tuf-on-ci-keyowner"
 TAG_ONLINE_URI = "x-tuf-on-ci-online-uri"
 
-# TODO Add a metadata cache so we don't constantly open files
+# Role name groups for membership tests
+_TOP_LEVEL_ROLES = frozenset(("root", "timestamp", "snapshot", "targets"))
+_ONLINE_ROLES = frozenset(("timestamp", "snapshot"))
+_OFFLINE_TOP_LEVEL_ROLES = frozenset(("root", "targets"))
+_NON_TARGETS_ROLES = frozenset(("root", "timestamp", "snapshot"))
+
+# Worker count for thread pools doing I/O bound work (file reads and copies)
+_IO_WORKERS = 8
+
 # TODO; Signing status probably should include an error message when valid=False
 
 logger = logging.getLogger(__name__)
 
 
+class _FastJSONDeserializer(JSONDeserializer):
+    """JSONDeserializer that uses orjson when it is available
+
+    Parsing is the bulk of the cost of opening metadata: orjson parses the
+    raw bytes directly and is considerably faster than the stdlib json.
+    """
+
+    def deserialize(self, raw_data: bytes) -> Metadata:
+        try:
+            return Metadata.from_dict(_json_loads(raw_data))
+        except Exception as e:
+            raise DeserializationError("Failed to deserialize JSON") from e
+
+
+_DESERIALIZER = _FastJSONDeserializer()
+_CJSON_SERIALIZER = CanonicalJSONSerializer()
+_JSON_SERIALIZER = JSONSerializer()
+
+
+def _match_component(name: str, component: str) -> bool:
+    """Return True if path component name matches a glob pattern component"""
+    if not has_magic(component):
+        return name == component
+    # like glob, wildcards do not match hidden files
+    if name.startswith(".") and not component.startswith("."):
+        return False
+    return fnmatch(name, component)
+
+
+def glob_match(path: str, patterns: Iterable[str]) -> bool:
+    """Return True if relative file path matches any of the glob patterns
+
+    Matching follows the same rules as glob_files() but does not access the
+    file system."""
+    names = path.split("/")
+    for pattern in patterns:
+        components = pattern.split("/")
+        if len(components) == len(names) and all(
+            _match_component(name, component)
+            for name, component in zip(names, components, strict=True)
+        ):
+            return True
+    return False
+
+
+def glob_files(root_dir: str, patterns: Iterable[str]) -> set[str]:
+    """Return paths (relative to root_dir) of files matching any of the patterns
+
+    The result is the same as combining glob(pattern, root_dir=root_dir) for all
+    patterns and keeping only files, but every directory is listed only once and
+    file types come from the directory listing instead of separate stat calls.
+
+    Pattern components "." and ".." are not supported: unlike with glob(), they
+    match nothing, so results are always within root_dir.
+    """
+    found: set[str] = set()
+
+    # work items are (directory relative to root_dir, pattern remainders)
+    pending: list[tuple[str, list[list[str]]]] = [
+        ("", [pattern.split("/") for pattern in patterns])
+    ]
+    while pending:
+        rel_dir, remainders = pending.pop()
+        try:
+            with os.scandir(os.path.join(root_dir, rel_dir)) as it:
+                entries = {entry.name: entry for entry in it}
+        except (FileNotFoundError, NotADirectoryError):
+            continue
+
+        subdirs: dict[str, list[list[str]]] = {}
+        for component, *rest in remainders:
+            if not has_magic(component):
+                names = [component] if component in entries else []
+            else:
+                names = [name for name in entries if _match_component(name, component)]
+
+            for name in names:
+                entry = entries[name]
+                path = f"{rel_dir}/{name}" if rel_dir else name
+                if not rest:
+                    if entry.is_file():
+                        found.add(path)
+                elif entry.is_dir():
+                    subdirs.setdefault(path, []).append(rest)
+
+        pending.extend(subdirs.items())
+
+    return found
+
+
+def _copy_to_all(src_path: str, dst_paths: list[str]) -> None:
+    """Copy src_path to the first destination and hardlink the others to it
+
+    Falls back to copying if hardlinking is not possible."""
+    first, *others = dst_paths
+    shutil.copyfile(src_path, first)
+    for dst_path in others:
+        with suppress(FileNotFoundError):
+            os.unlink(dst_path)
+        try:
+            os.link(first, dst_path)
+        except OSError:
+            shutil.copyfile(first, dst_path)
+
+
 def get_signer(key: Key) -> str:
-    if TAG_KEYOWNER in key.unrecognized_fields:
-        return key.unrecognized_fields[TAG_KEYOWNER]
+    fields = key.unrecognized_fields
+    keyowner = fields.get(TAG_KEYOWNER)
+    if keyowner is not None:
+        return keyowner
 
-    return key.unrecognized_fields[TAG_ONLINE_URI]
+    return fields[TAG_ONLINE_URI]
 
 
 @unique
@@ -83,27 +212,27 @@ class SigningEventState:
     def __init__(self, file_path: str):
         self._file_path = file_path
         self._invites: dict[str, list[str]] = {}
-        if os.path.exists(file_path):
-            with open(file_path) as f:
-                data = json.load(f)
-                self._invites = data["invites"]
+        try:
+            with open(file_path, "rb") as f:
+                data = _json_loads(f.read())
+            self._invites = data["invites"]
+        except FileNotFoundError:
+            pass
+
+        # reverse index of invites: rolename -> invited signers
+        self._role_to_signers: dict[str, list[str]] = {}
+        for invited_signer, invited_rolenames in self._invites.items():
+            for rolename in invited_rolenames:
+                self._role_to_signers.setdefault(rolename, []).append(invited_signer)
 
     def invited_signers_for_role(self, rolename: str) -> list[str]:
-        signers = []
-        for invited_signer, invited_rolenames in self._invites.items():
-            if rolename in invited_rolenames:
-                signers.append(invited_signer)
-        return signers
+        return list(self._role_to_signers.get(rolename, []))
 
     def roles_with_delegation_invites(self) -> set[str]:
-        roles = set()
-        for invitee_roles in self._invites.values():
-            for role in invitee_roles:
-                if role in ["root", "targets"]:
-                    roles.add("root")
-                else:
-                    roles.add("targets")
-        return roles
+        return {
+            "root" if role in _OFFLINE_TOP_LEVEL_ROLES else "targets"
+            for role in self._role_to_signers
+        }
 
 
 class CIRepository(Repository):
@@ -118,19 +247,49 @@ class CIRepository(Repository):
         self._dir = dir
         self._prev_dir = prev_dir
 
+        # Parsed metadata, keyed by file path. Entries are valid as long as the
+        # file (mtime and size) has not changed
+        self._md_cache: dict[str, tuple[tuple[int, int], Metadata]] = {}
+        # signing_expiry_period() results, invalidated when metadata is written
+        self._expiry_cache: dict[str, tuple[int, int]] = {}
+        self._now_cache: datetime | None = None
+
         # read signing event state file
         self.state = SigningEventState(os.path.join(self._dir, ".signing-event-state"))
 
+    def _now(self) -> datetime:
+        """Return current time: the same value is used for the lifetime of
+        the repository object (which in practice is a single command)"""
+        if self._now_cache is None:
+            self._now_cache = datetime.now(UTC)
+        return self._now_cache
+
     def _get_filename(self, role: str) -> str:
         return f"{self._dir}/{role}.json"
 
+    def _load(self, path: str) -> Metadata:
+        """Return metadata from path, using the metadata cache if possible
+
+        The returned object is shared: callers must not modify it (except
+        through edit())."""
+        st = os.stat(path)
+        stamp = (st.st_mtime_ns, st.st_size)
+        cached = self._md_cache.get(path)
+        if cached and cached[0] == stamp:
+            return cached[1]
+
+        with open(path, "rb") as f:
+            md = Metadata.from_bytes(f.read(), _DESERIALIZER)
+        self._md_cache[path] = (stamp, md)
+        return md
+
     def _get_keys(self, role: str, known_good: bool = False) -> list[Key]:
         """Return public keys for delegated role
 
         If known_good is True, use the keys defined in known good delegator.
         Otherwise use keys defined in the signing event delegator.
         """
-        if role in ["root", "timestamp", "snapshot", "targets"]:
+        if role in _TOP_LEVEL_ROLES:
             if known_good:
                 delegator: Root | Targets = self._known_good_root()
             else:
@@ -163,11 +322,13 @@ class CIRepository(Repository):
         """
         fname = self._get_filename(role)
 
-        if not os.path.exists(fname):
-            if role not in ["timestamp", "snapshot"]:
-                raise ValueError(f"Cannot create new {role} metadata")
+        try:
+            md = self._load(fname)
+        except FileNotFoundError:
+            if role not in _ONLINE_ROLES:
+                raise ValueError(f"Cannot create new {role} metadata") from None
             if role == "timestamp":
-                md: Metadata = Metadata(Timestamp())
+                md = Metadata(Timestamp())
                 # workaround https://github.com/theupdateframework/python-tuf/issues/2307
                 md.signed.snapshot_meta.version = 0
             else:
@@ -176,9 +337,6 @@ class CIRepository(Repository):
                 md.signed.meta.clear()
             # this makes version bumping in close() simpler
             md.signed.version = 0
-        else:
-            with open(fname, "rb") as f:
-                md = Metadata.from_bytes(f.read())
 
         return md
 
@@ -187,7 +345,11 @@ class CIRepository(Repository):
 
         If no signing expiry is configured, half the expiry period is used.
         """
-        if rolename in ["timestamp", "snapshot"]:
+        cached = self._expiry_cache.get(rolename)
+        if cached is not None:
+            return cached
+
+        if rolename in _ONLINE_ROLES:
             role = self.root().get_delegated_role(rolename)
             expiry_days = role.unrecognized_fields["x-tuf-on-ci-expiry-period"]
             signing_days = role.unrecognized_fields.get("x-tuf-on-ci-signing-period")
@@ -199,13 +361,35 @@ class CIRepository(Repository):
         if signing_days is None:
             signing_days = expiry_days // 2
 
+        self._expiry_cache[rolename] = (signing_days, expiry_days)
         return (signing_days, expiry_days)
 
+    def _invalidate_expiry_cache(self, rolename: str) -> None:
+        if rolename == "root":
+            # root defines the periods for timestamp and snapshot too
+            self._expiry_cache.clear()
+        else:
+            self._expiry_cache.pop(rolename, None)
+
+    def invalidate(self, rolename: str) -> None:
+        """Drop cached data for rolename
+
+        Call this after the metadata file has been modified outside of this
+        object (e.g. by git): the cache can not always detect such changes."""
+        self._md_cache.pop(self._get_filename(rolename), None)
+        self._invalidate_expiry_cache(rolename)
+
     def _write(self, rolename: str, md: Metadata) -> None:
         filename = self._get_filename(rolename)
-        data = md.to_bytes(JSONSerializer())
-        with open(filename, "wb") as f:
+        data = md.to_bytes(_JSON_SERIALIZER)
+        # write to a temporary file first so filename never contains partial data
+        tmp_filename = f"{filename}.tmp"
+        with open(tmp_filename, "wb") as f:
             f.write(data)
+        os.replace(tmp_filename, filename)
+        st = os.stat(filename)
+        self._md_cache[filename] = ((st.st_mtime_ns, st.st_size), md)
+        self._invalidate_expiry_cache(rolename)
 
         # For root, also store the versioned file
         if rolename == "root":
@@ -213,6 +397,19 @@ class CIRepository(Repository):
             with open(os.path.join(self._dir, "root_history", fname), "wb") as f:
                 f.write(data)
 
+    @contextmanager
+    def edit(self, role: str) -> Generator[Signed, None, None]:
+        """Implementation of Repository.edit() that keeps the metadata cache valid
+
+        The edited object may be the cached one: drop the cache entry once the
+        edit is done (even if it was aborted) so the changes cannot leak."""
+        try:
+            with super().edit(role) as signed:
+                yield signed
+        finally:
+            self._md_cache.pop(self._get_filename(role), None)
+            self._invalidate_expiry_cache(role)
+
     def close(self, rolename: str, md: Metadata) -> None:
         """Write metadata to a file in repo dir
 
@@ -222,11 +419,11 @@ class CIRepository(Repository):
 
         _, expiry_days = self.signing_expiry_period(rolename)
 
-        md.signed.expires = datetime.now(UTC) + timedelta(days=expiry_days)
+        md.signed.expires = self._now() + timedelta(days=expiry_days)
 
         md.signatures.clear()
         for key in self._get_keys(rolename):
-            if rolename in ["timestamp", "snapshot"]:
+            if rolename in _ONLINE_ROLES:
                 uri = key.unrecognized_fields[TAG_ONLINE_URI]
 
                 # FIXME: workaround for issue #422, only needed while sigstore
@@ -243,7 +440,7 @@ class CIRepository(Repository):
                 # offline signer, add empty sig
                 md.signatures[key.keyid] = Signature(key.keyid, "")
 
-        if rolename in ["timestamp", "snapshot"]:
+        if rolename in _ONLINE_ROLES:
             # repository should never write unsigned online roles
             self.root().verify_delegate(rolename, md.signed_bytes, md.signatures)
 
@@ -255,7 +452,9 @@ class CIRepository(Repository):
         Only targets roles are supported."""
         fname = self._get_filename(rolename)
 
-        if not os.path.exists(fname):
+        try:
+            md = self._load(fname)
+        except FileNotFoundError:
             return False
 
         # sign the metadata
@@ -267,8 +466,8 @@ class CIRepository(Repository):
         if not valid_keys:
             return False
 
-        with open(fname, "rb") as f:
-            md = Metadata.from_bytes(f.read())
+        # md is modified below: do not leave it in the cache until it is written
+        self._md_cache.pop(fname, None)
 
         for k in valid_keys:
             uri = k.unrecognized_fields[TAG_ONLINE_URI]
@@ -296,9 +495,13 @@ class CIRepository(Repository):
         targets = self.targets()
         targets_files["targets.json"] = MetaFile(targets.version)
         if targets.delegations and targets.delegations.roles:
-            for role in targets.delegations.roles.values():
-                version = self.targets(role.name).version
-                targets_files[f"{role.name}.json"] = MetaFile(version)
+            # The delegated metadata files are independent: load them in parallel
+            rolenames = list(targets.delegations.roles)
+            with ThreadPoolExecutor(_IO_WORKERS) as executor:
+                for rolename, role in zip(
+                    rolenames, executor.map(self.targets, rolenames), strict=True
+                ):
+                    targets_files[f"{rolename}.json"] = MetaFile(role.version)
 
         return targets_files
 
@@ -313,17 +516,23 @@ class CIRepository(Repository):
     def open_prev(self, role: str) -> Metadata | None:
         """Return known good metadata for role (if it exists)"""
         prev_fname = f"{self._prev_dir}/{role}.json"
-        if os.path.exists(prev_fname):
-            with open(prev_fname, "rb") as f:
-                return Metadata.from_bytes(f.read())
-
-        return None
+        try:
+            return self._load(prev_fname)
+        except FileNotFoundError:
+            return None
 
     def _validate_role(
-        self, delegator: Root | Targets, rolename: str
+        self,
+        delegator: Root | Targets,
+        rolename: str,
+        verified_keyids: set[str] | None = None,
     ) -> tuple[bool, str | None]:
         """Validate role compatibility with this repository
 
+        verified_keyids can be used to pass the keyids of already verified
+        signatures (from keys delegated by delegator): then signatures are not
+        verified again, only the threshold is checked.
+
         Returns bool for validity and optional error message"""
         md = self.open(rolename)
         prev_md = self.open_prev(rolename)
@@ -339,7 +548,7 @@ class CIRepository(Repository):
             return False, f"Version {md.signed.version} is not valid for {rolename}"
 
         days = md.signed.unrecognized_fields["x-tuf-on-ci-expiry-period"]
-        if md.signed.expires > datetime.now(UTC) + timedelta(days=days):
+        if md.signed.expires > self._now() + timedelta(days=days):
             return False, f"Expiry date is further than expected {days} days ahead"
 
         if isinstance(md.signed, Root):
@@ -382,9 +591,12 @@ class CIRepository(Repository):
         # * check there are no delegations
         # * check that target files in metadata match the files in targets/
 
-        try:
-            delegator.verify_delegate(rolename, md.signed_bytes, md.signatures)
-        except UnsignedMetadataError:
+        if verified_keyids is None:
+            try:
+                delegator.verify_delegate(rolename, md.signed_bytes, md.signatures)
+            except UnsignedMetadataError:
+                return False, None
+        elif len(verified_keyids) < delegator.get_delegated_role(rolename).threshold:
             return False, None
 
         return True, None
@@ -402,74 +614,80 @@ class CIRepository(Repository):
                 if paths:
                     patterns = paths
 
-        for pattern in patterns:
-            for fname in glob(pattern, root_dir=target_dir):
-                realpath = os.path.join(target_dir, fname)
-                if not os.path.isfile(realpath):
-                    continue
+        def hash_file(fname: str) -> TargetFile:
+            realpath = os.path.join(target_dir, fname)
+            return TargetFile.from_file(fname, realpath, ["sha256"])
 
-                targetfiles[fname] = TargetFile.from_file(fname, realpath, ["sha256"])
+        # glob_files() returns every file once even if several patterns match it.
+        # hashlib releases the GIL while hashing: hash the files in parallel
+        fnames = glob_files(target_dir, patterns)
+        with ThreadPoolExecutor(_IO_WORKERS) as executor:
+            for targetfile in executor.map(hash_file, fnames):
+                targetfiles[targetfile.path] = targetfile
         return targetfiles
 
     def _known_good_root(self) -> Root:
         """Return the Root object from the known-good repository state"""
         assert self._prev_dir is not None
         prev_path = os.path.join(self._prev_dir, "root.json")
-        if os.path.exists(prev_path):
-            with open(prev_path, "rb") as f:
-                md = Metadata.from_bytes(f.read())
-            assert isinstance(md.signed, Root)
-            return md.signed
+        try:
+            md = self._load(prev_path)
+        except FileNotFoundError:
+            # this role did not exist: return an empty one for comparison purposes
+            return Root()
 
-        # this role did not exist: return an empty one for comparison purposes
-        return Root()
+        assert isinstance(md.signed, Root)
+        return md.signed
 
     def _known_good_targets(self, rolename: str) -> Targets:
         """Return Targets from the known good version (signing event start point)"""
         assert self._prev_dir
         prev_path = os.path.join(self._prev_dir, f"{rolename}.json")
-        if os.path.exists(prev_path):
-            with open(prev_path, "rb") as f:
-                md = Metadata.from_bytes(f.read())
-            assert isinstance(md.signed, Targets)
-            return md.signed
+        try:
+            md = self._load(prev_path)
+        except FileNotFoundError:
+            # this role did not exist: return an empty one for comparison purposes
+            return Targets()
 
-        # this role did not exist: return an empty one for comparison purposes
-        return Targets()
+        assert isinstance(md.signed, Targets)
+        return md.signed
 
     def _get_target_changes(self, rolename: str) -> list[TargetState]:
         """Compare targetfiles in known good version and signing event version:
         return list of changes"""
 
-        if rolename in ["root", "timestamp", "snapshot"]:
+        if rolename in _NON_TARGETS_ROLES:
             return []
 
-        changes = []
-
         known_good_targetfiles = self._known_good_targets(rolename).targets
-        for targetfile in self.targets(rolename).targets.values():
-            if targetfile.path not in known_good_targetfiles:
+        targetfiles = self.targets(rolename).targets
+        if targetfiles == known_good_targetfiles:
+            # no changes in signing event
+            return []
+
+        changes = []
+        for path, targetfile in targetfiles.items():
+            known_good_targetfile = known_good_targetfiles.get(path)
+            if known_good_targetfile is None:
                 # new in signing event
                 changes.append(TargetState(targetfile, State.ADDED))
-            elif targetfile != known_good_targetfiles[targetfile.path]:
+            elif targetfile != known_good_targetfile:
                 # changed in signing event
                 changes.append(TargetState(targetfile, State.MODIFIED))
-                del known_good_targetfiles[targetfile.path]
-            else:
-                # no changes in signing event
-                del known_good_targetfiles[targetfile.path]
 
-        for targetfile in known_good_targetfiles.values():
-            changes.append(TargetState(targetfile, State.REMOVED))
+        for path, targetfile in known_good_targetfiles.items():
+            if path not in targetfiles:
+                changes.append(TargetState(targetfile, State.REMOVED))
 
         return changes
 
     def _get_signing_status(
-        self, rolename: str, known_good: bool
+        self, rolename: str, known_good: bool, include_target_changes: bool = False
     ) -> SigningStatus | None:
         """Build signing status for role.
 
         This method relies on event state (.signing-event-state) to be accurate.
+        target_changes is only filled in if include_target_changes is True.
         Returns None only when known_good is True, and then in two cases: if delegating
         role is not root (because then the known good state is irrelevant) and also if
         there is no known good version yet.
@@ -490,7 +708,7 @@ class CIRepository(Repository):
             if not delegator:
                 # Not root role or there is no known-good root metadata yet
                 return None
-        elif rolename in ["root", "targets"]:
+        elif rolename in _OFFLINE_TOP_LEVEL_ROLES:
             delegator = self.root()
         else:
             delegator = self.targets()
@@ -507,23 +725,36 @@ class CIRepository(Repository):
         role = delegator.get_delegated_role(rolename)
 
         # Build lists of signed signers and not signed signers
+        payload = _CJSON_SERIALIZER.serialize(md.signed)
+        signatures = md.signatures
+        verified_keyids = set()
         for key in self._get_keys(rolename, known_good):
             keyowner = get_signer(key)
+            sig = signatures.get(key.keyid)
+            if sig is None:
+                missing_sigs.add(keyowner)
+                continue
             try:
-                payload = CanonicalJSONSerializer().serialize(md.signed)
-                key.verify_signature(md.signatures[key.keyid], payload)
+                key.verify_signature(sig, payload)
                 sigs.add(keyowner)
-            except (KeyError, UnverifiedSignatureError):
+                verified_keyids.add(key.keyid)
+            except UnverifiedSignatureError:
                 missing_sigs.add(keyowner)
 
         # Document changes to targets metadata in this signing event
-        target_changes = self._get_target_changes(rolename)
+        target_changes: list[TargetState] = []
+        if include_target_changes:
+            target_changes = self._get_target_changes(rolename)
 
         # Just to be sure: double check that delegation threshold is reached
         if invites:
             valid, msg = False, None
-        else:
+        elif known_good:
+            # known good keys are filtered (see _get_keys()): verify all signatures
             valid, msg = self._validate_role(delegator, rolename)
+        else:
+            # signatures from all keys of delegator were verified above
+            valid, msg = self._validate_role(delegator, rolename, verified_keyids)
 
         return SigningStatus(
             invites, sigs, missing_sigs, role.threshold, target_changes, valid, msg
@@ -535,11 +766,13 @@ class CIRepository(Repository):
         In case of root, another SigningStatus may be returned for the previous
         'known good' root.
         Uses .signing-event-state file."""
-        if rolename in ["timestamp", "snapshot"]:
+        if rolename in _ONLINE_ROLES:
             raise ValueError("Not supported for online metadata")
 
         known_good_status = self._get_signing_status(rolename, known_good=True)
-        signing_event_status = self._get_signing_status(rolename, known_good=False)
+        signing_event_status = self._get_signing_status(
+            rolename, known_good=False, include_target_changes=True
+        )
         assert signing_event_status is not None
 
         return signing_event_status, known_good_status
@@ -550,39 +783,61 @@ class CIRepository(Repository):
         if artifact_path:
             os.makedirs(artifact_path, exist_ok=True)
 
-        for src_path in glob(os.path.join(self._dir, "root_history", "*.root.json")):
-            shutil.copy(src_path, metadata_path)
-        shutil.copy(os.path.join(self._dir, "timestamp.json"), metadata_path)
-
-        snapshot = self.snapshot()
-        dst_path = os.path.join(metadata_path, f"{snapshot.version}.snapshot.json")
-        shutil.copy(os.path.join(self._dir, "snapshot.json"), dst_path)
-
-        # Include all targets/artifacts that are part of the delegation tree
-        delegated_roles = ["targets"]
-        while delegated_roles:
-            rolename = delegated_roles.pop()
-            filename = f"{rolename}.json"
-            role = self.targets(rolename)
-
-            # copy delegated targets role metadata
-            src_path = os.path.join(self._dir, filename)
-            dst_path = os.path.join(metadata_path, f"{role.version}.{filename}")
-            shutil.copy(src_path, dst_path)
-
-            if artifact_path:
-                # copy artifacts
-                for target in role.targets.values():
-                    rdir, sep, name = target.path.rpartition("/")
-                    os.makedirs(os.path.join(artifact_path, rdir), exist_ok=True)
-                    src_path = os.path.join(self._dir, "..", "targets", rdir, name)
-                    for hash in target.hashes.values():
-                        dst_path = os.path.join(artifact_path, rdir, f"{hash}.{name}")
-                        shutil.copy(src_path, dst_path)
-
-            # Add delegated roles
-            if role.delegations and role.delegations.roles:
-                delegated_roles.extend(role.delegations.roles.keys())
+        # File copies are independent of each other: run them in a thread pool
+        copies: list[Future] = []
+        with ThreadPoolExecutor(_IO_WORKERS) as executor:
+
+            def copy(src_path: str, dst_path: str) -> None:
+                # copyfile: file mode and other metadata do not need to be copied
+                copies.append(executor.submit(shutil.copyfile, src_path, dst_path))
+
+            for src_path in glob(
+                os.path.join(self._dir, "root_history", "*.root.json")
+            ):
+                copy(src_path, os.path.join(metadata_path, os.path.basename(src_path)))
+            copy(
+                os.path.join(self._dir, "timestamp.json"),
+                os.path.join(metadata_path, "timestamp.json"),
+            )
+
+            snapshot = self.snapshot()
+            dst_path = os.path.join(metadata_path, f"{snapshot.version}.snapshot.json")
+            copy(os.path.join(self._dir, "snapshot.json"), dst_path)
+
+            # Include all targets/artifacts that are part of the delegation tree
+            delegated_roles = ["targets"]
+            while delegated_roles:
+                rolename = delegated_roles.pop()
+                filename = f"{rolename}.json"
+                role = self.targets(rolename)
+
+                # copy delegated targets role metadata
+                src_path = os.path.join(self._dir, filename)
+                dst_path = os.path.join(metadata_path, f"{role.version}.{filename}")
+                copy(src_path, dst_path)
+
+                if artifact_path:
+                    # copy artifacts
+                    for target in role.targets.values():
+                        rdir, sep, name = target.path.rpartition("/")
+                        os.makedirs(os.path.join(artifact_path, rdir), exist_ok=True)
+                        src_path = os.path.join(self._dir, "..", "targets", rdir, name)
+                        # content is identical for all hash prefixed names
+                        dst_paths = [
+                            os.path.join(artifact_path, rdir, f"{hash}.{name}")
+                            for hash in target.hashes.values()
+                        ]
+                        copies.append(
+                            executor.submit(_copy_to_all, src_path, dst_paths)
+                        )
+
+                # Add delegated roles
+                if role.delegations and role.delegations.roles:
+                    delegated_roles.extend(role.delegations.roles.keys())
+
+        # raise the first copy error, if any
+        for future in copies:
+            future.result()
 
     def bump_expiring(self, rolename: str) -> int | None:
         """Create a new version of role if it is about to expire"""
@@ -593,7 +848,7 @@ class CIRepository(Repository):
             delta = timedelta(days=signing_days)
 
             logger.debug(f"{rolename} signing period starts {signed.expires - delta}")
-            if datetime.now(UTC) + delta < signed.expires:
+            if self._now() + delta < signed.expires:
                 # no need to bump version
                 bumped = False
                 raise AbortEdit
@@ -601,7 +856,7 @@ class CIRepository(Repository):
         return signed.version if bumped else None
 
     def update_targets(self, rolename: str) -> bool:
-        if rolename in ["root", "timestamp", "snapshot"]:
+        if rolename in _NON_TARGETS_ROLES:
             return False
 
         new_tfiles = self._build_targets(
@@ -623,7 +878,7 @@ class CIRepository(Repository):
     def is_signed(self, rolename: str) -> bool:
         """Return True if role is correctly signed"""
         md = self.open(rolename)
-        if rolename in ["root", "timestamp", "snapshot", "targets"]:
+        if rolename in _TOP_LEVEL_ROLES:
             delegator: Root | Targets = self.root()
         else:
             delegator = self.targets()
@@ -639,4 +894,4 @@ class CIRepository(Repository):
         role_md = self.open(rolename)
         signing_days, _ = self.signing_expiry_period(rolename)
         delta = timedelta(days=signing_days)
-        return datetime.now(UTC) >= role_md.signed.expires - delta
+        return self._now() >= role_md.signed.expires - delta
@@ -4,40 +4,52 @@
 
 import logging
 import os
-import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from datetime import UTC, datetime, timedelta
+from functools import cache
+from typing import TextIO
 from urllib import parse
 
 import click
 from tuf.api.metadata import Root, Signed, Targets
 
-from tuf_on_ci._repository import CIRepository
+from tuf_on_ci._git import git_output, git_start
+from tuf_on_ci._repository import _IO_WORKERS, CIRepository
 from tuf_on_ci._version import __version__
 
 logger = logging.getLogger(__name__)
 
-
-def _git(cmd: list[str]) -> subprocess.CompletedProcess:
-    cmd = [
-        "git",
-        "-c",
-        "user.name=tuf-on-ci",
-        "-c",
-        "user.email=41898282+github-actions[bot]@users.noreply.github.com",
-        *cmd,
-    ]
-    proc = subprocess.run(cmd, check=True, capture_output=True, text=True)
-    logger.debug("%s:\n%s", cmd, proc.stdout)
-    return proc
-
-
-def build_description(repo: CIRepository) -> str:
-    lines = [
-        "## TUF Repository state",
-        "",
-        "| Role | Signing starts | Expires | Signers |",
-        "| - | - | - | - |",
-    ]
+# Templates for the repository description (index.md)
+_HEADER = """\
+## TUF Repository state
+
+| Role | Signing starts | Expires | Signers |
+| - | - | - | - |
+"""
+_ROW = (
+    '| {rolename} (<a href="{json_link}">json</a>) | {signing_date} '
+    "| {expiry} UTC | {signers} ({threshold} of {signer_count} required) |\n"
+)
+_FOOTER = """
+_Generated {now} from
+[{project}]({project_link}) commit [{head:.7}]({project_link}/tree/{head})
+by [TUF-on-CI](https://github.com/theupdateframework/tuf-on-ci) v{version}._"""
+
+
+@cache
+def _git_source() -> tuple[str, str]:
+    """Return HEAD commit and origin url of the repository
+
+    Neither changes while the process runs so the result is cached."""
+    # The git commands are independent: run them concurrently
+    head_proc = git_start(["rev-parse", "HEAD"])
+    url_proc = git_start(["config", "--get", "remote.origin.url"])
+    return git_output(head_proc), git_output(url_proc)
+
+
+def write_description(repo: CIRepository, out: TextIO) -> None:
+    """Write the repository description (markdown) into out"""
+    out.write(_HEADER)
     root = repo.root()
     targets = repo.targets()
     roles: list[tuple[Root | Targets, str]] = [
@@ -50,15 +62,27 @@ def build_description(repo: CIRepository) -> str:
         for rolename in targets.delegations.roles:
             roles.append((targets, rolename))
 
+    # Load all role metadata before formatting the table: the files are
+    # independent so read and parse them in parallel
+    rolenames = [rolename for _, rolename in roles]
+    with ThreadPoolExecutor(_IO_WORKERS) as executor:
+        delegates: dict[str, Signed] = {
+            rolename: md.signed
+            for rolename, md in zip(
+                rolenames, executor.map(repo.open, rolenames), strict=True
+            )
+        }
+
     for delegator, rolename in roles:
         role = delegator.get_delegated_role(rolename)
-        keys = [delegator.get_key(keyid) for keyid in role.keyids]
-        signers = []
-        for key in keys:
-            owner = key.unrecognized_fields.get("x-tuf-on-ci-keyowner", "_online key_")
-            signers.append(owner)
-
-        delegate: Signed = repo.open(rolename).signed
+        signers = [
+            delegator.get_key(keyid).unrecognized_fields.get(
+                "x-tuf-on-ci-keyowner", "_online key_"
+            )
+            for keyid in role.keyids
+        ]
+
+        delegate = delegates[rolename]
         if rolename == "timestamp":
             json_link = f"{rolename}.json"
         else:
@@ -68,28 +92,35 @@ def build_description(repo: CIRepository) -> str:
         signing = expiry - timedelta(days=signing_days)
         signing_date = signing.strftime("%Y-%m-%d")
 
-        name_str = f'{rolename} (<a href="{json_link}">json</a>)'
-        threshold_str = f"{role.threshold} of {len(signers)}"
-        signer_str = f"{', '.join(signers)} ({threshold_str} required)"
-
-        lines.append(f"| {name_str} | {signing_date} | {expiry} UTC | {signer_str} |")
+        out.write(
+            _ROW.format(
+                rolename=rolename,
+                json_link=json_link,
+                signing_date=signing_date,
+                expiry=expiry,
+                signers=", ".join(signers),
+                threshold=role.threshold,
+                signer_count=len(signers),
+            )
+        )
 
     now = datetime.now(UTC).isoformat(timespec="minutes")
-    head = _git(["rev-parse", "HEAD"]).stdout.strip()
+    head, origin_url = _git_source()
 
-    url = parse.urlparse(_git(["config", "--get", "remote.origin.url"]).stdout.strip())
+    url = parse.urlparse(origin_url)
     owner_project = url.path.removesuffix(".git")
     _, _, project = owner_project.rpartition("/")
     project_link = f"https://github.com{owner_project}"
 
-    commit_link = f"[{head[:7]}]({project_link}/tree/{head})"
-    tuf_on_ci_url = "https://github.com/theupdateframework/tuf-on-ci"
-
-    lines.append(f"\n_Generated {now} from")
-    lines.append(f"[{project}]({project_link}) commit {commit_link}")
-    lines.append(f"by [TUF-on-CI]({tuf_on_ci_url}) v{__version__}._")
-
-    return "\n".join(lines)
+    out.write(
+        _FOOTER.format(
+            now=now,
+            project=project,
+            project_link=project_link,
+            head=head,
+            version=__version__,
+        )
+    )
 
 
 @click.command()  # type: ignore[arg-type]
@@ -108,4 +139,4 @@ def build_repository(verbose: int, metadata: str, artifacts: str | None) -> None
         click.echo(f"Artifacts published in {artifacts}")
 
     with open(os.path.join(metadata, "index.md"), "w") as f:
-        f.write(build_description(repo))
+        write_description(repo, f)
@@ -7,21 +7,26 @@ import logging
 import os
 import shutil
 import sys
-from datetime import datetime
-from filecmp import cmp
+from datetime import UTC, datetime
 from tempfile import TemporaryDirectory
 from urllib import request
 
 import click
 from tuf.api.exceptions import ExpiredMetadataError
-from tuf.api.metadata import Metadata
-from tuf.ngclient import Updater, UpdaterConfig
+from tuf.ngclient import RequestsFetcher, Updater, UpdaterConfig
 
 
-def expiry_check(dir: str, role: str, timestamp: int):
-    ref_time = datetime.fromtimestamp(timestamp)
-    md = Metadata.from_file(os.path.join(dir, f"{role}.json"))
-    expiry = md.signed.expires
+def _files_equal(path1: str, path2: str) -> bool:
+    """Return True if the files have identical content"""
+    # differing sizes are a cheap early answer, otherwise compare content
+    if os.stat(path1).st_size != os.stat(path2).st_size:
+        return False
+    with open(path1, "rb") as f1, open(path2, "rb") as f2:
+        return f1.read() == f2.read()
+
+
+def expiry_check(expiry: datetime, role: str, timestamp: int):
+    ref_time = datetime.fromtimestamp(timestamp, tz=UTC)
     if ref_time > expiry:
         sys.exit(f"Error: {role} expires {expiry} (expected valid at {ref_time})")
     print(f"Role {role} is valid on {ref_time}: OK")
@@ -64,21 +69,32 @@ def client(
         # Allow for a large number of root rotations, as metadata is
         # not cached during testing
         config = UpdaterConfig(max_root_rotations=256)
+        # Share the fetcher between updaters so that HTTP sessions are reused
+        fetcher = RequestsFetcher()
 
         # initialize client with --initial-root or from metadata_url
         if initial_root is not None:
-            shutil.copy(initial_root, os.path.join(metadata_dir, "root.json"))
+            shutil.copyfile(initial_root, os.path.join(metadata_dir, "root.json"))
         else:
             root_url = f"{metadata_url}/1.root.json"
             try:
-                request.urlretrieve(root_url, f"{metadata_dir}/root.json")  # noqa: S310
+                with (
+                    request.urlopen(root_url, timeout=30) as resp,  # noqa: S310
+                    open(f"{metadata_dir}/root.json", "wb") as out,
+                ):
+                    shutil.copyfileobj(resp, out)
             except OSError as e:
                 sys.exit(f"Failed to download initial root {root_url}: {e}")
 
         if update_base_url is not None:
             # Update client to update_base_url before doing the actual update
             updater = Updater(
-                metadata_dir, update_base_url, artifact_dir, artifact_url, config=config
+                metadata_dir,
+                update_base_url,
+                artifact_dir,
+                artifact_url,
+                fetcher=fetcher,
+                config=config,
             )
             try:
                 updater.refresh()
@@ -88,13 +104,18 @@ def client(
 
         # Update client to metadata_url
         updater = Updater(
-            metadata_dir, metadata_url, artifact_dir, artifact_url, config=config
+            metadata_dir,
+            metadata_url,
+            artifact_dir,
+            artifact_url,
+            fetcher=fetcher,
+            config=config,
         )
         ref_time_string = ""
         if time is not None:
             # HACK: replace reference time with ours: initial root has been loaded
             # already but that is fine: the expiry check only happens during refresh
-            ref_time = datetime.fromtimestamp(time)
+            ref_time = datetime.fromtimestamp(time, tz=UTC)
             updater._trusted_set.reference_time = ref_time
             ref_time_string = f" at reference time {ref_time}"
 
@@ -110,14 +131,16 @@ def client(
             for f in ["root.json", "timestamp.json"]:
                 client_file = os.path.join(metadata_dir, f)
                 source_file = os.path.join(compare_source, f)
-                if not cmp(source_file, client_file, shallow=False):
+                if not _files_equal(source_file, client_file):
                     sys.exit(f"Error: metadata does not match sources: {f} failed")
             print("Client metadata matches sources: OK")
 
         # Verify root and targets are valid at given reference time
         if offline_time is not None:
-            expiry_check(metadata_dir, "root", offline_time)
-            expiry_check(metadata_dir, "targets", offline_time)
+            # the updater has already loaded and verified the metadata
+            trusted_set = updater._trusted_set
+            expiry_check(trusted_set.root.expires, "root", offline_time)
+            expiry_check(trusted_set.targets.expires, "targets", offline_time)
 
         if expected_artifact:
             # Test expected artifact existence
@@ -3,30 +3,16 @@
 """Command line tool to create signing events for roles that are about to expire"""
 
 import logging
-import subprocess
-from glob import glob
+import os
 
 import click
 
+from tuf_on_ci._git import git
 from tuf_on_ci._repository import CIRepository
 
 logger = logging.getLogger(__name__)
 
 
-def _git(cmd: list[str]) -> subprocess.CompletedProcess:
-    cmd = [
-        "git",
-        "-c",
-        "user.name=TUF-on-CI",
-        "-c",
-        "user.email=41898282+github-actions[bot]@users.noreply.github.com",
-        *cmd,
-    ]
-    proc = subprocess.run(cmd, check=True, capture_output=True, text=True)
-    logger.debug("%s:\n%s", cmd, proc.stdout)
-    return proc
-
-
 @click.command()  # type: ignore[arg-type]
 @click.option("-v", "--verbose", count=True, default=0)
 @click.option("--push/--no-push", default=False)
@@ -41,11 +27,23 @@ def create_signing_events(verbose: int, push: bool) -> None:
 
     repo = CIRepository("metadata")
     events = []
-    for filename in glob("*.json", root_dir="metadata"):
-        if filename in ["timestamp.json", "snapshot.json"]:
-            continue
 
-        rolename = filename[: -len(".json")]
+    # list existing signing event branches once instead of checking each ref
+    ref_prefix = "refs/remotes/origin/sign" if push else "refs/heads/sign"
+    proc = git(["for-each-ref", "--format=%(refname)", ref_prefix])
+    existing_refs = set(proc.stdout.splitlines())
+
+    with os.scandir("metadata") as it:
+        rolenames = [
+            entry.name.removesuffix(".json")
+            for entry in it
+            if entry.name.endswith(".json")
+            and not entry.name.startswith(".")
+            and entry.name not in ("timestamp.json", "snapshot.json")
+            and entry.is_file()
+        ]
+
+    for rolename in rolenames:
         version = repo.bump_expiring(rolename)
         if version is None:
             logging.debug("No version bump needed for %s", rolename)
@@ -53,25 +51,32 @@ def create_signing_events(verbose: int, push: bool) -> None:
 
         msg = f"Periodic version bump: {rolename} v{version}"
         event = f"sign/{rolename}-v{version}"
-        ref = f"refs/remotes/origin/{event}" if push else f"refs/heads/{event}"
+        ref = f"{ref_prefix}/{rolename}-v{version}"
         files = [f"metadata/{rolename}.json"]
         if rolename == "root":
             files.append(f"metadata/root_history/{version}.root.json")
 
-        _git(["add", "--", *files])
-        _git(["commit", "-m", msg, "--signoff"])
-        try:
-            _git(["show-ref", "--quiet", "--verify", ref])
+        if ref in existing_refs:
+            # No commit needed: just restore the worktree to HEAD state
             logging.debug("Signing event branch %s already exists", event)
-        except subprocess.CalledProcessError:
-            events.append(event)
-            if push:
-                _git(["push", "origin", f"HEAD:{event}"])
-            else:
-                _git(["branch", event])
+            git(["checkout", "--quiet", "HEAD", "--", files[0]], capture=False)
+            repo.invalidate(rolename)
+            if rolename == "root":
+                # the versioned root file is new (untracked)
+                os.remove(files[1])
+            continue
+
+        git(["add", "--", *files], capture=False)
+        git(["commit", "-m", msg, "--signoff"], capture=False)
+        events.append(event)
+        if push:
+            git(["push", "origin", f"HEAD:{event}"], capture=False)
+        else:
+            git(["branch", event], capture=False)
 
         # get back to original HEAD (before we commited)
-        _git(["reset", "--hard", "HEAD^"])
+        git(["reset", "--hard", "HEAD^"], capture=False)
+        repo.invalidate(rolename)
 
     # print out list of created event branches
     click.echo(" ".join(events))
@@ -3,29 +3,15 @@
 """Command line online signing tool for TUF-on-CI"""
 
 import logging
-import subprocess
 
 import click
 
+from tuf_on_ci._git import git
 from tuf_on_ci._repository import CIRepository
 
 logger = logging.getLogger(__name__)
 
 
-def _git(cmd: list[str]) -> subprocess.CompletedProcess:
-    cmd = [
-        "git",
-        "-c",
-        "user.name=tuf-on-ci",
-        "-c",
-        "user.email=41898282+github-actions[bot]@users.noreply.github.com",
-        *cmd,
-    ]
-    proc = subprocess.run(cmd, check=True, text=True)
-    logger.debug("%s:\n%s", cmd, proc.stdout)
-    return proc
-
-
 @click.command()  # type: ignore[arg-type]
 @click.option("-v", "--verbose", count=True, default=0)
 @click.option("--push/--no-push", default=False)
@@ -58,9 +44,10 @@ def online_sign(verbose: int, push: bool) -> None:
         msg = f"Online sign ({roles})"
 
         click.echo(msg)
-        _git(["add", "metadata/timestamp.json", "metadata/snapshot.json"])
-        _git(["commit", "-m", msg, "--signoff"])
+        git(["add", "metadata/timestamp.json", "metadata/snapshot.json"], capture=False)
+        # online signing commits have always used this name
+        git(["commit", "-m", msg, "--signoff"], capture=False, name="tuf-on-ci")
         if push:
-            _git(["push", "origin", "HEAD"])
+            git(["push", "origin", "HEAD"], capture=False)
     else:
         click.echo("Online signing not needed")
@@ -2,59 +2,91 @@
 
 """Command line signing event status output tool for TUF-on-CI"""
 
-import filecmp
 import logging
 import os
 import subprocess
 import sys
-from glob import glob
+from collections.abc import Generator
+from contextlib import contextmanager
 from tempfile import TemporaryDirectory
 
 import click
 
-from tuf_on_ci._repository import CIRepository
+from tuf_on_ci._git import git
+from tuf_on_ci._repository import CIRepository, SigningStatus, glob_match
 
 logger = logging.getLogger(__name__)
 
 
-def _git(cmd: list[str]) -> subprocess.CompletedProcess:
-    cmd = [
-        "git",
-        "-c",
-        "user.name=TUF-on-CI",
-        "-c",
-        "user.email=41898282+github-actions[bot]@users.noreply.github.com",
-        *cmd,
-    ]
-    proc = subprocess.run(cmd, check=True, capture_output=True, text=True)
-    logger.debug("%s:\n%s", cmd, proc.stdout)
-    return proc
+def _head_info() -> tuple[str, str]:
+    """Return current branch name (empty if detached) and HEAD commit"""
+    # --abbrev-ref would return e.g. "heads/sign/foo" if the name is ambiguous
+    proc = git(["rev-parse", "HEAD", "--symbolic-full-name", "HEAD"])
+    head, ref = proc.stdout.split()
+    return ref.removeprefix("refs/heads/") if ref != "HEAD" else "", head
 
 
-def _find_changed_roles(known_good_dir: str, signing_event_dir: str) -> set[str]:
-    # find the files that have changed or been added
-    # TODO what about removed roles?
+def _checkout(worktree_dir: str, commit: str, paths: list[str]) -> None:
+    """Check out paths from commit into a worktree
 
-    files = glob("*.json", root_dir=signing_event_dir)
+    Paths that do not exist in commit are skipped."""
+    ls_tree = git(["ls-tree", "--name-only", commit, "--", *paths])
+    existing = ls_tree.stdout.splitlines()
+    if existing:
+        git(
+            ["-C", worktree_dir, "checkout", "--quiet", commit, "--", *existing],
+            capture=False,
+        )
+
+
+@contextmanager
+def _known_good_worktree(commit: str) -> Generator[str, None, None]:
+    """Check out commit metadata in a temporary worktree, yield the worktree path
+
+    A worktree shares the object database with the current repository, unlike
+    a clone it does not need to copy any objects. Only metadata is checked out
+    (artifacts may be large): use _checkout() if other paths are needed."""
+    with TemporaryDirectory() as temp_dir:
+        known_good_dir = os.path.join(temp_dir, "known-good")
+        worktree_cmd = ["worktree", "add", "--detach", "--no-checkout", "--quiet"]
+        git([*worktree_cmd, known_good_dir, commit], capture=False)
+        try:
+            _checkout(known_good_dir, commit, ["metadata"])
+            yield known_good_dir
+        finally:
+            git(["worktree", "remove", "--force", known_good_dir], capture=False)
+
+
+def _git_changed_files(commit: str, path: str) -> list[str]:
+    """Return paths under path that changed between commit and HEAD
+
+    Paths are NUL-separated so that git does not quote unusual file names."""
+    diff = git(
+        ["diff", "--name-only", "-z", "--no-renames", f"{commit}..HEAD", "--", path]
+    )
+    return [name for name in diff.stdout.split("\0") if name]
+
+
+def _git_changed_roles(commit: str) -> set[str]:
+    """Return roles whose metadata changed or was added between commit and HEAD"""
     changed_roles = set()
-    for fname in files:
-        if not os.path.exists(f"{known_good_dir}/{fname}") or not filecmp.cmp(
-            f"{signing_event_dir}/{fname}", f"{known_good_dir}/{fname}", shallow=False
-        ):
-            if fname in ["timestamp.json", "snapshot.json"]:
-                raise RuntimeError("Unexpected change in online files")
+    for path in _git_changed_files(commit, "metadata/"):
+        dirname, fname = os.path.split(path)
+        if dirname != "metadata" or not fname.endswith(".json"):
+            continue
+        # removed roles are not reported
+        if not os.path.exists(path):
+            continue
+        if fname in ["timestamp.json", "snapshot.json"]:
+            raise RuntimeError("Unexpected change in online files")
 
-            changed_roles.add(fname[: -len(".json")])
+        changed_roles.add(fname.removesuffix(".json"))
 
     return changed_roles
 
 
-def _find_changed_target_roles(
-    repo: CIRepository, known_good_targets_dir: str, targets_dir: str
-) -> set[str]:
-    """Compare two artifact directories, return rolenames that have artifacts changes"""
-
-    files = []
+def _artifact_patterns(repo: CIRepository) -> list[str]:
+    """Return glob patterns of all artifacts that targets roles can contain"""
     patterns = ["*"]
     delegations = repo.targets("targets").delegations
     if delegations and delegations.roles:
@@ -62,40 +94,33 @@ def _find_changed_target_roles(
             paths = delegations.roles[role].paths
             if paths:
                 patterns.extend(paths)
-    for pattern in patterns:
-        files += glob(pattern, root_dir=targets_dir)
-        files += glob(pattern, root_dir=known_good_targets_dir)
+    return patterns
 
-    changed_roles = set()
-    for filepath in files:
-        f1 = os.path.join(targets_dir, filepath)
-        f2 = os.path.join(known_good_targets_dir, filepath)
 
-        # subdirs are allowed to exist, appear and disappear
-        if os.path.isdir(f1) and os.path.isdir(f2):
-            continue
-        if os.path.isdir(f1) and not os.path.exists(f2):
-            continue
-        if not os.path.exists(f1) and os.path.isdir(f2):
-            continue
+def _artifact_rolename(filepath: str) -> str:
+    """Return the rolename for an artifact path. "targets" is a special case"""
+    rolename, slash, _ = filepath.partition("/")
+    return rolename if slash else "targets"
 
-        try:
-            if filecmp.cmp(f1, f2, shallow=False):
-                continue
-        except FileNotFoundError:
-            pass
 
-        # found a changed artifact, add rolename to set. "targets" is a special case
-        rolename, slash, _ = filepath.partition("/")
-        if not slash:
-            rolename = "targets"
-        changed_roles.add(rolename)
+def _git_changed_target_roles(repo: CIRepository, commit: str) -> set[str]:
+    """Return rolenames that have artifact changes between commit and HEAD"""
+    patterns = _artifact_patterns(repo)
+    changed_roles = set()
+    for path in _git_changed_files(commit, "targets/"):
+        filepath = path.removeprefix("targets/")
+        if glob_match(filepath, patterns):
+            changed_roles.add(_artifact_rolename(filepath))
 
     return changed_roles
 
 
-def _role_status(repo: CIRepository, role: str, event_name) -> bool:
-    status, prev_status = repo.status(role)
+def _role_status(
+    role: str, statuses: tuple[SigningStatus, SigningStatus | None], event_name
+) -> bool:
+    status, prev_status = statuses
+    # collect the output so that it is written out at once
+    lines: list[str] = []
     role_is_valid = status.valid
     sig_counts = f"{len(status.signed)}/{status.threshold}"
     signed = status.signed
@@ -109,46 +134,47 @@ def _role_status(repo: CIRepository, role: str, event_name) -> bool:
         missing = missing | prev_status.missing
 
     emoji = "white_check_mark" if role_is_valid and not status.invites else "x"
-    click.echo(f"#### :{emoji}: {role}")
+    lines.append(f"#### :{emoji}: {role}")
 
     if status.invites:
         invites = ", ".join(status.invites)
-        click.echo(f"Role `{role}` delegations have open invites ({invites}).")
-        click.echo(
+        lines.append(f"Role `{role}` delegations have open invites ({invites}).")
+        lines.append(
             "Invitees can accept the invitations by running "
             f"`tuf-on-ci-sign {event_name}`"
         )
 
     if not status.invites:
         if status.target_changes:
-            click.echo(f"Role `{role}` contains following artifact changes:")
+            lines.append(f"Role `{role}` contains following artifact changes:")
             for target_state in status.target_changes:
-                click.echo(f" * {target_state}")
-            click.echo("")
+                lines.append(f" * {target_state}")
+            lines.append("")
 
         if role_is_valid:
-            click.echo(
+            lines.append(
                 f"Role `{role}` is verified and signed by {sig_counts} signers "
                 f"({', '.join(signed)})."
             )
         elif signed:
-            click.echo(
+            lines.append(
                 f"Role `{role}` is not yet verified. It is signed by {sig_counts} "
                 f"signers ({', '.join(signed)})."
             )
         else:
-            click.echo(f"Role `{role}` is unsigned and not yet verified")
+            lines.append(f"Role `{role}` is unsigned and not yet verified")
 
         if missing:
-            click.echo(f"Still missing signatures from {', '.join(missing)}")
-            click.echo(
+            lines.append(f"Still missing signatures from {', '.join(missing)}")
+            lines.append(
                 "Signers can sign these changes by running "
                 f"`tuf-on-ci-sign {event_name}`"
             )
 
     if status.message:
-        click.echo(f"**Error**: {status.message}")
+        lines.append(f"**Error**: {status.message}")
 
+    click.echo("\n".join(lines))
     return role_is_valid and not status.invites
 
 
@@ -166,38 +192,33 @@ def update_targets(verbose: int, push: bool) -> None:
     """
     logging.basicConfig(level=logging.WARNING - verbose * 10)
 
-    event_name = _git(["branch", "--show-current"]).stdout.strip()
-    head = _git(["rev-parse", "HEAD"]).stdout.strip()
+    event_name, head = _head_info()
 
     if not os.path.exists("metadata/root.json"):
         sys.exit(1)
 
     # Find the known-good commit
-    merge_base = _git(["merge-base", "origin/main", "HEAD"]).stdout.strip()
+    merge_base = git(["merge-base", "origin/main", "HEAD"]).stdout.strip()
     if head == merge_base:
         click.echo("This signing event contains no changes yet")
         sys.exit(1)
 
-    with TemporaryDirectory() as known_good_dir:
-        _git(["clone", "--quiet", ".", known_good_dir])
-        _git(["-C", known_good_dir, "checkout", "--quiet", merge_base])
-
+    with _known_good_worktree(merge_base) as known_good_dir:
         good_metadata = os.path.join(known_good_dir, "metadata")
-        good_targets = os.path.join(known_good_dir, "targets")
 
         # Find artifacts that have changed in this signing event
         # Update targets metadata for those artifacts if needed.
         repo = CIRepository("metadata", good_metadata)
-        roles = _find_changed_target_roles(repo, good_targets, "targets")
+        roles = _git_changed_target_roles(repo, merge_base)
 
         # Update targets metadata if necessary
-        updated_targets = []
-        for role in roles:
-            if repo.update_targets(role):
-                # metadata and artifacts were not in sync: commit new metadata
-                msg = f"Update targets metadata for role {role}"
-                _git(["commit", "-m", msg, "--signoff", "--", f"metadata/{role}.json"])
-                updated_targets.append(f"`{role}`")
+        updated_roles = [role for role in sorted(roles) if repo.update_targets(role)]
+        if updated_roles:
+            # metadata and artifacts were not in sync: commit new metadata
+            msg = f"Update targets metadata for role(s) {', '.join(updated_roles)}"
+            files = [f"metadata/{role}.json" for role in updated_roles]
+            git(["commit", "-m", msg, "--signoff", "--", *files], capture=False)
+        updated_targets = [f"`{role}`" for role in updated_roles]
 
     if updated_targets:
         click.echo("### Artifacts have been modified")
@@ -209,7 +230,7 @@ def update_targets(verbose: int, push: bool) -> None:
 
     if push and updated_targets:
         try:
-            _git(["push", "origin", event_name])
+            git(["push", "origin", event_name])
         except subprocess.CalledProcessError as e:
             # Figure out if this is an error caused by remote being ahead
             # of local branch
@@ -241,8 +262,7 @@ def online_sign_targets(verbose: int, push: bool, roles: list[str]) -> None:
     if not os.path.exists("metadata/root.json"):
         sys.exit(1)
 
-    event_name = _git(["branch", "--show-current"]).stdout.strip()
-    head = _git(["rev-parse", "HEAD"]).stdout.strip()
+    event_name, head = _head_info()
 
     signed_targets = []
     repo = CIRepository("metadata")
@@ -257,7 +277,10 @@ def online_sign_targets(verbose: int, push: bool, roles: list[str]) -> None:
         # no need to modify the metadata: just sign what is there
         if repo.sign(role):
             msg = f"Online sign targets role {role}"
-            _git(["commit", "-m", msg, "--signoff", "--", f"metadata/{role}.json"])
+            git(
+                ["commit", "-m", msg, "--signoff", "--", f"metadata/{role}.json"],
+                capture=False,
+            )
             signed_targets.append(f"`{role}`")
 
     if signed_targets:
@@ -270,7 +293,7 @@ def online_sign_targets(verbose: int, push: bool, roles: list[str]) -> None:
 
     if push and signed_targets:
         try:
-            _git(["push", "origin", event_name])
+            git(["push", "origin", event_name])
         except subprocess.CalledProcessError as e:
             # Figure out if this is an error caused by remote being ahead
             # of local branch
@@ -292,8 +315,7 @@ def status(verbose: int) -> None:
     """Status markdown output tool"""
     logging.basicConfig(level=logging.WARNING - verbose * 10)
 
-    event_name = _git(["branch", "--show-current"]).stdout.strip()
-    head = _git(["rev-parse", "HEAD"]).stdout.strip()
+    event_name, head = _head_info()
 
     click.echo("### Current signing event state")
     click.echo(f"Event [{event_name}](../compare/{event_name}) (commit {head[:7]})")
@@ -306,15 +328,12 @@ def status(verbose: int) -> None:
         sys.exit(1)
 
     # Find the known-good commit
-    merge_base = _git(["merge-base", "origin/main", "HEAD"]).stdout.strip()
+    merge_base = git(["merge-base", "origin/main", "HEAD"]).stdout.strip()
     if head == merge_base:
         click.echo("This signing event contains no changes yet")
         sys.exit(1)
 
-    with TemporaryDirectory() as known_good_dir:
-        _git(["clone", "--quiet", ".", known_good_dir])
-        _git(["-C", known_good_dir, "checkout", "--quiet", merge_base])
-
+    with _known_good_worktree(merge_base) as known_good_dir:
         good_metadata = os.path.join(known_good_dir, "metadata")
 
         # Compare current repository and the known good version.
@@ -322,19 +341,15 @@ def status(verbose: int) -> None:
         repo = CIRepository("metadata", good_metadata)
 
         # first create a list of roles with metadata or artifact changes or invites
-        roles = list(
-            _find_changed_roles(good_metadata, "metadata")
-            | repo.state.roles_with_delegation_invites()
-        )
-        # reorder, toplevels first
-        for toplevel in ["targets", "root"]:
-            if toplevel in roles:
-                roles.remove(toplevel)
-                roles.insert(0, toplevel)
+        changed_roles = _git_changed_roles(merge_base)
+        present = changed_roles | repo.state.roles_with_delegation_invites()
+        # toplevels first, then the delegated roles in a deterministic order
+        toplevels = [role for role in ["root", "targets"] if role in present]
+        roles = toplevels + sorted(present.difference(toplevels))
 
         success = True
         for role in roles:
-            if not _role_status(repo, role, event_name):
+            if not _role_status(role, repo.status(role), event_name):
                 success = False
 
     sys.exit(0 if success else 1)
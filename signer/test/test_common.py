@@ -0,0 +1,119 @@
+import io
+import json
+import os
+import time
+import unittest
+from tempfile import TemporaryDirectory
+from unittest import mock
+from urllib.error import HTTPError
+
+from tuf_on_ci_sign._common import application_update_reminder
+
+
+class _TTY(io.StringIO):
+    """stdout replacement that claims to be a terminal"""
+
+    def isatty(self) -> bool:
+        return True
+
+
+def _response(versions: list[str], headers: dict[str, str]) -> io.BytesIO:
+    """Return a fake pypi simple API response"""
+    response = io.BytesIO(json.dumps({"versions": versions}).encode())
+    response.headers = headers  # type: ignore[attr-defined]
+    return response
+
+
+class TestUpdateReminder(unittest.TestCase):
+    def setUp(self):
+        temp_dir = TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.cache_file = os.path.join(temp_dir.name, "pypi_release.json")
+
+        patches = [
+            mock.patch.dict(os.environ),
+            mock.patch("tuf_on_ci_sign.__version__", "1.0.0"),
+            mock.patch(
+                "tuf_on_ci_sign._common.user_cache_dir", return_value=temp_dir.name
+            ),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        os.environ.pop("TUF_ON_CI_NO_UPDATE_CHECK", None)
+
+        urlopen_patch = mock.patch("tuf_on_ci_sign._common.urlopen")
+        self.urlopen = urlopen_patch.start()
+        self.addCleanup(urlopen_patch.stop)
+
+    def _write_cache(self, cache: dict[str, str], age_days: int) -> None:
+        with open(self.cache_file, "w") as f:
+            json.dump(cache, f)
+        mtime = time.time() - age_days * 24 * 60 * 60
+        os.utime(self.cache_file, (mtime, mtime))
+
+    def _run(self, stdout: io.StringIO) -> str:
+        with mock.patch("sys.stdout", stdout):
+            application_update_reminder()
+        return stdout.getvalue()
+
+    def test_not_a_tty(self):
+        self.assertEqual(self._run(io.StringIO()), "")
+        self.urlopen.assert_not_called()
+
+    def test_no_cache(self):
+        self.urlopen.return_value = _response(
+            ["0.9", "2.0", "3.0rc1"], {"ETag": '"etag1"'}
+        )
+        output = self._run(_TTY())
+        self.assertIn("New version (2.0) is available", output)
+
+        # request is not conditional without a cached version
+        request = self.urlopen.call_args.args[0]
+        self.assertIsNone(request.get_header("If-none-match"))
+
+        with open(self.cache_file) as f:
+            self.assertEqual(json.load(f), {"version": "2.0", "etag": '"etag1"'})
+
+    def test_recent_cache(self):
+        self._write_cache({"version": "2.0", "etag": '"etag1"'}, 0)
+        output = self._run(_TTY())
+        self.assertIn("New version (2.0) is available", output)
+        self.urlopen.assert_not_called()
+
+    def test_not_modified(self):
+        self._write_cache({"version": "2.0", "etag": '"etag1"'}, 2)
+        self.urlopen.side_effect = HTTPError(
+            "https://pypi.org/simple/tuf-on-ci-sign/", 304, "Not Modified", {}, None
+        )
+        output = self._run(_TTY())
+        self.assertIn("New version (2.0) is available", output)
+
+        # request is conditional: the cached version is used on 304
+        request = self.urlopen.call_args.args[0]
+        self.assertEqual(request.get_header("If-none-match"), '"etag1"')
+
+        # the cache is now considered recent again
+        self.assertGreater(os.stat(self.cache_file).st_mtime, time.time() - 60)
+        with open(self.cache_file) as f:
+            self.assertEqual(json.load(f), {"version": "2.0", "etag": '"etag1"'})
+
+    def test_modified(self):
+        self._write_cache({"version": "2.0", "etag": '"etag1"'}, 2)
+        self.urlopen.return_value = _response(["2.0", "2.1"], {"ETag": '"etag2"'})
+        output = self._run(_TTY())
+        self.assertIn("New version (2.1) is available", output)
+
+        with open(self.cache_file) as f:
+            self.assertEqual(json.load(f), {"version": "2.1", "etag": '"etag2"'})
+
+    def test_up_to_date(self):
+        self.urlopen.return_value = _response(["0.9", "1.0.0"], {})
+        self.assertEqual(self._run(_TTY()), "")
+
+        with open(self.cache_file) as f:
+            self.assertEqual(json.load(f), {"version": "1.0.0"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -6,12 +6,15 @@ import json
 import logging
 import os
 import subprocess
+import sys
 import webbrowser
 from collections.abc import Generator
-from contextlib import contextmanager
+from contextlib import contextmanager, suppress
 from datetime import datetime, timedelta
+from functools import cache
 from tempfile import TemporaryDirectory
 from urllib import parse
+from urllib.error import HTTPError
 from urllib.request import Request, urlopen
 
 import click
@@ -27,7 +30,7 @@ logger = logging.getLogger(__name__)
 
 @contextmanager
 def signing_event(name: str, config: User) -> Generator[SignerRepository, None, None]:
-    toplevel = git(["rev-parse", "--show-toplevel"])
+    toplevel = get_toplevel()
 
     # PyKCS11 (Yubikey support) needs the module path
     # TODO: if config is not set, complain/ask the user?
@@ -47,13 +50,23 @@ def signing_event(name: str, config: User) -> Generator[SignerRepository, None,
         with TemporaryDirectory() as temp_dir:
             base_sha = git_expect(["merge-base", f"{config.pull_remote}/main", "HEAD"])
             event_sha = git_expect(["rev-parse", "HEAD"])
-            git_expect(["clone", "--quiet", toplevel, temp_dir])
-            git_expect(["-C", temp_dir, "checkout", "--quiet", base_sha])
-            base_metadata_dir = os.path.join(temp_dir, "metadata")
-            metadata_dir = os.path.join(toplevel, "metadata")
-
-            click.echo(bold_blue(f"Signing event {name} (commit {event_sha[:7]})"))
-            yield SignerRepository(metadata_dir, base_metadata_dir, config)
+            # a worktree shares the object database: nothing needs to be copied.
+            # Only metadata is needed (artifacts may be large): check out nothing
+            # else. The base may not contain metadata if the repository is new
+            base_dir = os.path.join(temp_dir, "base")
+            worktree_cmd = ["worktree", "add", "--detach", "--no-checkout", "--quiet"]
+            git_expect([*worktree_cmd, base_dir, base_sha])
+            try:
+                if git_expect(["ls-tree", "--name-only", base_sha, "metadata"]):
+                    checkout_cmd = ["-C", base_dir, "checkout", "--quiet", base_sha]
+                    git_expect([*checkout_cmd, "--", "metadata"])
+                base_metadata_dir = os.path.join(base_dir, "metadata")
+                metadata_dir = os.path.join(toplevel, "metadata")
+
+                click.echo(bold_blue(f"Signing event {name} (commit {event_sha[:7]})"))
+                yield SignerRepository(metadata_dir, base_metadata_dir, config)
+            finally:
+                git_expect(["worktree", "remove", "--force", base_dir])
     finally:
         # go back to original branch
         git_expect(["checkout", "-"])
@@ -86,12 +99,25 @@ def get_signing_key_input() -> Key:
     return key
 
 
+# git commands here never need optional locks (e.g. index refresh in status)
+_GIT_ENV = {**os.environ, "GIT_OPTIONAL_LOCKS": "0"}
+
+
 def git(cmd: list[str]) -> str:
     cmd = ["git", *cmd]
-    proc = subprocess.run(cmd, capture_output=True, check=True, text=True)
+    proc = subprocess.run(cmd, capture_output=True, check=True, text=True, env=_GIT_ENV)
     return proc.stdout.strip()
 
 
+@cache
+def get_toplevel() -> str:
+    """Return the top level directory of the git working tree
+
+    The result does not change during the process lifetime so it is only
+    looked up once."""
+    return git_expect(["rev-parse", "--show-toplevel"])
+
+
 def git_expect(cmd: list[str]) -> str:
     """Run git, expect success"""
     try:
@@ -118,34 +144,53 @@ def bold_blue(text: str) -> str:
 def application_update_reminder() -> None:
     from tuf_on_ci_sign import __version__
 
-    update_file = os.path.join(user_cache_dir("tuf-on-ci-sign"), "pypi_release_version")
-    try:
-        update_time = os.path.getmtime(update_file)
-    except OSError:
-        update_time = 0
+    # Nobody reads the reminder in non-interactive use: skip the network request
+    if os.environ.get("TUF_ON_CI_NO_UPDATE_CHECK") or not sys.stdout.isatty():
+        return
+
+    # cache contains the newest release version and the pypi response ETag
+    update_file = os.path.join(user_cache_dir("tuf-on-ci-sign"), "pypi_release.json")
+    cache: dict[str, str] = {}
+    update_time = 0.0
+    with suppress(OSError, ValueError), open(update_file) as f:
+        cache = json.load(f)
+        update_time = os.fstat(f.fileno()).st_mtime
 
     try:
-        if datetime.fromtimestamp(update_time) + timedelta(days=1) > datetime.now():
+        recent = datetime.fromtimestamp(update_time) + timedelta(days=1)
+        if "version" in cache and recent > datetime.now():
             # It's been less than a day since last pypi query
-            with open(update_file) as f:
-                max_version = Version(f.read())
+            max_version = Version(cache["version"])
         else:
             # Find out newest release version from pypi
             request = Request("https://pypi.org/simple/tuf-on-ci-sign/")
             request.add_header("Accept", "application/vnd.pypi.simple.v1+json")
-            with urlopen(request, timeout=5) as response:  # noqa: S310
-                data = json.load(response)
-
-            max_version = Version("0")
-            for ver_str in data["versions"]:
-                ver = Version(ver_str)
-                if not ver.is_devrelease and not ver.is_prerelease:
-                    max_version = max(max_version, ver)
-
-            # store the current version number in cache
-            os.makedirs(os.path.dirname(update_file), exist_ok=True)
-            with open(update_file, "w") as f:
-                f.write(str(max_version))
+            if "version" in cache and "etag" in cache:
+                # pypi responds "304 Not Modified" if cached version is current
+                request.add_header("If-None-Match", cache["etag"])
+            try:
+                with urlopen(request, timeout=5) as response:  # noqa: S310
+                    data = json.load(response)
+                    etag = response.headers.get("ETag")
+            except HTTPError as e:
+                if e.code != 304 or "version" not in cache:
+                    raise
+                max_version = Version(cache["version"])
+                os.utime(update_file)
+            else:
+                max_version = Version("0")
+                for ver_str in data["versions"]:
+                    ver = Version(ver_str)
+                    if not ver.is_devrelease and not ver.is_prerelease:
+                        max_version = max(max_version, ver)
+
+                # store the current version number in cache
+                cache = {"version": str(max_version)}
+                if etag:
+                    cache["etag"] = etag
+                os.makedirs(os.path.dirname(update_file), exist_ok=True)
+                with open(update_file, "w") as f:
+                    json.dump(cache, f)
 
         if max_version > Version(__version__):
             msg = bold(
@@ -204,7 +249,7 @@ def push_changes(user: User, event_name: str, title: str) -> None:
 def get_repo_name(remote: str) -> str:
     """Return 'owner/repo' string for given GitHub remote"""
     url = parse.urlparse(git_expect(["config", "--get", f"remote.{remote}.url"]))
-    owner_repo = url.path[: -len(".git")]
+    owner_repo = url.path.removesuffix(".git")
     # ssh-urls are relative URLs according to urllib: host is actually part of
     # path. We don't want the host part:
     _, _, owner_repo = owner_repo.rpartition(":")
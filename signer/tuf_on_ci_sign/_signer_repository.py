@@ -99,7 +99,7 @@ def _find_changed_roles(known_good_dir: str, signing_event_dir: str) -> list[str
             if fname in ["timestamp.json", "snapshot.json"]:
                 raise RuntimeError("Unexpected change in online files")
 
-            changed_roles.append(fname[: -len(".json")])
+            changed_roles.append(fname.removesuffix(".json"))
 
     # reorder, toplevels first
     for toplevel in ["targets", "root"]:
@@ -26,6 +26,7 @@ from tuf_on_ci_sign._common import (
     bold,
     get_repo_name,
     get_signing_key_input,
+    get_toplevel,
     git_expect,
     push_changes,
     signing_event,
@@ -51,6 +52,7 @@ logger = logging.getLogger(__name__)
 def _get_offline_input(
     role: str,
     config: OfflineConfig,
+    user_config: User,
 ) -> tuple[OfflineConfig, Key]:
     config = copy.deepcopy(config)
     click.echo(f"\nConfiguring role {role}")
@@ -117,9 +119,6 @@ def _get_offline_input(
                         value_proc=verify_signers,
                     )
                 elif signer_choice == 2:
-                    toplevel = git_expect(["rev-parse", "--show-toplevel"])
-                    settings_path = os.path.join(toplevel, ".tuf-on-ci-sign.ini")
-                    user_config = User(settings_path)
                     online_key = _collect_online_key(user_config)
                     uri = online_key.unrecognized_fields[TAG_ONLINE_URI]
                     config.signers = [uri]
@@ -305,9 +304,9 @@ def _init_repository(repo: SignerRepository) -> bool:
     click.echo("Creating a new TUF-on-CI repository")
 
     root_config, _ = _get_offline_input(
-        "root", OfflineConfig([repo.user.name], 1, 365, 60)
+        "root", OfflineConfig([repo.user.name], 1, 365, 60), repo.user
     )
-    targets_config, _ = _get_offline_input("targets", deepcopy(root_config))
+    targets_config, _ = _get_offline_input("targets", deepcopy(root_config), repo.user)
 
     # As default we offer sigstore online key(s)
     keys = _sigstore_import(repo.user.pull_remote)
@@ -348,11 +347,11 @@ def _update_offline_role(repo: SignerRepository, role: str) -> bool:
         # Non existent role
         click.echo(f"Creating a new delegation for {role}")
         new_config, online_key = _get_offline_input(
-            role, OfflineConfig([repo.user.name], 1, 365, 60)
+            role, OfflineConfig([repo.user.name], 1, 365, 60), repo.user
         )
     else:
         click.echo(f"Modifying delegation for {role}")
-        new_config, online_key = _get_offline_input(role, config)
+        new_config, online_key = _get_offline_input(role, config, repo.user)
         if new_config == config:
             return False
 
@@ -386,7 +385,7 @@ def delegate(
 
     application_update_reminder()
 
-    toplevel = git_expect(["rev-parse", "--show-toplevel"])
+    toplevel = get_toplevel()
     settings_path = os.path.join(toplevel, ".tuf-on-ci-sign.ini")
     user_config = User(settings_path)
 
@@ -13,6 +13,7 @@ from tuf.api.metadata import Key, Role, Signed
 
 from tuf_on_ci_sign._common import (
     bold,
+    get_toplevel,
     git_echo,
     git_expect,
     signing_event,
@@ -125,7 +126,7 @@ def import_repo(verbose: int, push: bool, event_name: str, import_file: str | No
     """
     logging.basicConfig(level=logging.WARNING - verbose * 10)
 
-    toplevel = git_expect(["rev-parse", "--show-toplevel"])
+    toplevel = get_toplevel()
     settings_path = os.path.join(toplevel, ".tuf-on-ci-sign.ini")
     user_config = User(settings_path)
 
@@ -143,7 +144,7 @@ def import_repo(verbose: int, push: bool, event_name: str, import_file: str | No
             for filename in filenames:
                 if not filename.endswith(".json"):
                     continue
-                rolename = filename[: -len(".json")]
+                rolename = filename.removesuffix(".json")
                 if rolename in ["root", "timestamp", "snapshot", "targets"]:
                     continue
                 roles.append(rolename)
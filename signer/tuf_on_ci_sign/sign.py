@@ -10,6 +10,7 @@ import click
 from tuf_on_ci_sign._common import (
     application_update_reminder,
     get_signing_key_input,
+    get_toplevel,
     git_expect,
     push_changes,
     signing_event,
@@ -31,7 +32,7 @@ def sign(verbose: int, push: bool, event_name: str):
 
     application_update_reminder()
 
-    toplevel = git_expect(["rev-parse", "--show-toplevel"])
+    toplevel = get_toplevel()
     settings_path = os.path.join(toplevel, ".tuf-on-ci-sign.ini")
     user_config = User(settings_path)
 